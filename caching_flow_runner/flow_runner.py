@@ -1,10 +1,12 @@
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 import prefect
 from prefect import Flow
 from prefect import Parameter
+from prefect import Task
 from prefect.engine import FlowRunner
 from prefect.engine.state import State
+from prefect.engine.state import Success
 
 from caching_flow_runner.lock_storage import LockStore
 from caching_flow_runner.task_runner import CachedTaskRunner
@@ -15,19 +17,28 @@ from caching_flow_runner.task_runner import task_qualified_name
 
 
 class CachedFlowRunner(FlowRunner):
-    def __init__(self, *args, lock_store: LockStore, optimise_flow=False, **kwargs):
+    def __init__(
+        self,
+        *args,
+        lock_store: LockStore,
+        optimise_flow=False,
+        target_tasks: Iterable[Task] = None,
+        **kwargs,
+    ):
+        if optimise_flow and target_tasks:
+            raise ValueError("`optimise_flow` and `target_tasks` cannot be used together.")
         super().__init__(*args, task_runner_cls=CachedTaskRunner, **kwargs)
         self.lock_store = lock_store
         self._optimise_flow = optimise_flow
+        self._target_tasks = set(target_tasks or [])
 
     @staticmethod
-    def optimise_flow(flow: Flow, parameters: Dict[str, Any] = None):  # noqa: C901
+    def cached_task_hashes(flow: Flow, parameters: Dict[str, Any] = None) -> Dict[Task, Dict]:
         """
-        Walk the graph in this flow from the roots, substituting parameters and determining (based on the lock file)
-        which tasks can safely be dropped from computation/loading from the cache.
+        Walk the graph in this flow from the roots, substituting parameters and returning the result hash (based on the
+        lock file) of every task whose inputs match the hashes it was last run with.
         """
         with prefect.context(parameters=parameters):
-            # Determine which tasks are cached
             state = {}
             for task in flow.sorted_tasks():
                 skip = False
@@ -55,41 +66,129 @@ class CachedFlowRunner(FlowRunner):
                 # At this point - the task
                 if isinstance(task, Parameter):
                     state[task] = _hash_result(task.run(), serializer=task.result.serializer)
-                else:
+                elif "result" in lock:
                     state[task] = lock["result"]
 
-            # Determine which tasks we can safely drop. We have to walk the graph twice AFAICT because I think we're
-            # doing a depth first walk.
-            tasks_to_drop = set()
-            edges_to_drop = set()
-            for task in flow.sorted_tasks():
-                all_upstreams_valid = (
-                    all([upstream in state for upstream in flow.edges_to(task)]) or True
-                )  # if empty
-                task_valid = task in state
-                if all_upstreams_valid and task_valid:
-                    tasks_to_drop.add(task)
-                    edges_to_drop.update(flow.edges_from(task))
-                else:
-                    # We need to remove any upstreams of this task from being dropped because they will be the inputs
-                    for edge in flow.edges_to(task):
-                        if edge.upstream_task in tasks_to_drop:
-                            tasks_to_drop.remove(edge.upstream_task)
-                            edges_to_drop.remove(edge)
-
-            # Finally, drop the tasks & edges from the flow
-            for edge in edges_to_drop:
+            return state
+
+    @staticmethod
+    def optimise_flow(flow: Flow, parameters: Dict[str, Any] = None):
+        """
+        Walk the graph in this flow from the roots, substituting parameters and determining (based on the lock file)
+        which tasks can safely be dropped from computation/loading from the cache.
+        """
+        # Determine which tasks are cached
+        state = CachedFlowRunner.cached_task_hashes(flow=flow, parameters=parameters)
+
+        # Determine which tasks we can safely drop. We have to walk the graph twice AFAICT because I think we're
+        # doing a depth first walk.
+        tasks_to_drop = set()
+        edges_to_drop = set()
+        for task in flow.sorted_tasks():
+            all_upstreams_valid = (
+                all([upstream in state for upstream in flow.edges_to(task)]) or True
+            )  # if empty
+            task_valid = task in state
+            if all_upstreams_valid and task_valid:
+                tasks_to_drop.add(task)
+                edges_to_drop.update(flow.edges_from(task))
+            else:
+                # We need to remove any upstreams of this task from being dropped because they will be the inputs
+                for edge in flow.edges_to(task):
+                    if edge.upstream_task in tasks_to_drop:
+                        tasks_to_drop.remove(edge.upstream_task)
+                        edges_to_drop.remove(edge)
+
+        # Finally, drop the tasks & edges from the flow
+        for edge in edges_to_drop:
+            flow.edges.remove(edge)
+        for task in tasks_to_drop:
+            flow.tasks.remove(task)
+
+        return flow
+
+    @staticmethod
+    def _load_cached_state(task: Task, flow: Flow) -> Optional[State]:
+        """
+        Read the result of a cached task back from the target location recorded in its lock, returning `None` if
+        there is no readable result or it doesn't match the locked result hash. Like `TaskRunner`, falls back to the
+        flow's result when the task has none.
+        """
+        lock = get_lock(key=task_qualified_name(task=task))
+        location = lock.get("location")
+        result = task.result or flow.result
+        if location is None or result is None:
+            return None
+        # The recorded location is already formatted, escape it so `exists` formatting it again is a no-op
+        if not result.exists(location.replace("{", "{{").replace("}", "}}")):
+            return None
+        loaded = result.read(location)
+        if _hash_result(result=loaded.value, serializer=result.serializer) != lock.get("result"):
+            return None
+        return Success(result=loaded, message=f"Loaded from target {location}")
+
+    @staticmethod
+    def prune_flow(
+        flow: Flow, target_tasks: Iterable[Task], parameters: Dict[str, Any] = None
+    ) -> Tuple[Flow, Dict[Task, State]]:
+        """
+        Reduce this flow to the minimal upstream closure of `target_tasks`. The graph is walked upstream from the
+        targets and the walk stops at any cached task (based on the lock file) whose result can be loaded from its
+        target. Returns the pruned flow along with the loaded states for these cached frontier tasks.
+        """
+        target_tasks = set(target_tasks)
+        if target_tasks.difference(flow.tasks):
+            raise ValueError("Some tasks in target_tasks were not found in the flow.")
+
+        hashes = CachedFlowRunner.cached_task_hashes(flow=flow, parameters=parameters)
+
+        # Walk upstream from the targets, stopping at any task we can serve from the cache
+        tasks_to_keep = set()
+        cached_states = {}
+        to_visit = list(target_tasks)
+        while to_visit:
+            task = to_visit.pop()
+            if task in tasks_to_keep:
+                continue
+            tasks_to_keep.add(task)
+
+            if task in hashes:
+                state = CachedFlowRunner._load_cached_state(task=task, flow=flow)
+                if state is not None:
+                    cached_states[task] = state
+                    continue
+
+            to_visit.extend(edge.upstream_task for edge in flow.edges_to(task))
+
+        # Drop every task (and any edges touching it) that isn't required by the targets
+        for edge in list(flow.edges):
+            if edge.upstream_task not in tasks_to_keep or edge.downstream_task not in tasks_to_keep:
                 flow.edges.remove(edge)
-            for task in tasks_to_drop:
-                flow.tasks.remove(task)
+        for task in flow.tasks.difference(tasks_to_keep):
+            flow.tasks.remove(task)
+        flow.set_reference_tasks(set(flow._reference_tasks).intersection(tasks_to_keep))
 
-            return flow
+        return flow, cached_states
 
     def run(self, *args, **kwargs):
         """
         Because parameters are not injected until `run`, we need to overload this method to perform optimisation
         """
-        if self._optimise_flow:
+        if self._target_tasks:
+            # Locks are usually only loaded in `get_flow_run_state`, but we need them now to find the cached frontier
+            self.set_locks_for_flow_run()
+            self.flow, cached_states = self.prune_flow(
+                flow=self.flow.copy(),
+                target_tasks=self._target_tasks,
+                parameters=kwargs.get("parameters"),
+            )
+            task_states = dict(kwargs.get("task_states") or {})
+            for task, state in cached_states.items():
+                task_states.setdefault(task, state)
+            kwargs["task_states"] = task_states
+            if kwargs.get("return_tasks") is not None:
+                kwargs["return_tasks"] = set(kwargs["return_tasks"]).intersection(self.flow.tasks)
+        elif self._optimise_flow:
             self.flow = self.optimise_flow(
                 flow=self.flow.copy(), parameters=kwargs.get("parameters")
             )
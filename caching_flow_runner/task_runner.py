@@ -83,11 +83,15 @@ class CachedTaskRunner(TaskRunner):
     def _generate_task_lock(self, state: State):
         lock = get_lock(self.task_full_name)
         raw_inputs = lock["raw_inputs"]
-        return {
+        task_lock = {
             "inputs": _hash_inputs(inputs=raw_inputs),
             "source": _hash_source(func=self.task.run, name=self.task.name),
             "result": _hash_result(result=state.result, serializer=self.result.serializer),
+            # Record where the result was written so it can be loaded without re-running upstream tasks. Always set,
+            # even when `None`, so a location from an earlier run isn't kept when the lock is merged on save.
+            "location": state._result.location,
         }
+        return task_lock
 
     def _on_success(self, new_state):
         self.logger.info(f"Setting task lock for {self.task_full_name} based on {new_state}")
@@ -3,15 +3,18 @@ task_lock_instance = {
         "inputs": {"a": {"hash": "c0a8a20f903a4915b94db8de3ea63195", "size": 1}},
         "result": {"hash": "c0a8a20f903a4915b94db8de3ea63195", "size": 5},
         "source": {"hash": "778cd87d0b99fc228af8e3a25279a063", "size": 25},
+        "location": None,
     },
     "caching_flow_runner.test_utils.tasks.inc": {
         "inputs": {"b": {"hash": "c0a8a20f903a4915b94db8de3ea63195", "size": 5}},
         "result": {"hash": "58e78e1b34eb49a68c65b54815d1b158", "size": 5},
         "source": {"hash": "c73e09342bcaf950e6567511509cd0a4", "size": 29},
+        "location": None,
     },
     "caching_flow_runner.test_utils.tasks.multiply": {
         "inputs": {"c": {"hash": "58e78e1b34eb49a68c65b54815d1b158", "size": 5}},
         "result": {"hash": "5cd9541ea58b401f115b751e79eabbff", "size": 5},
         "source": {"hash": "3aa6df2f718e7a56dacb9ef51010bf07", "size": 34},
+        "location": None,
     },
 }
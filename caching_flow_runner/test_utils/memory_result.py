@@ -54,8 +54,6 @@ class MemoryResult(Result):
         return new
 
     def exists(self, location: str, **kwargs: Any) -> bool:
-        if "task_hash_name" not in kwargs:
-            return False
         path = f"{self.root}{location.format(**kwargs)}"
         exists = self.fs.exists(path)
         self.logger.info(f"Checking exists {path=} {exists=}")
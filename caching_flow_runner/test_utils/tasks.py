@@ -21,6 +21,11 @@ def inc(b):
     return b + 1
 
 
+@task(checkpoint=True, target=task_hashed_filename)
+def dec(d):
+    return d - 1
+
+
 @task()
 def multiply(c):
     return c * 2
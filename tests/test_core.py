@@ -6,6 +6,7 @@ import pytest
 from prefect import Flow
 from prefect import Parameter
 from prefect.engine.state import Cached
+from prefect.engine.state import Pending
 from prefect.engine.state import Success
 
 from caching_flow_runner.flow_runner import CachedFlowRunner
@@ -15,10 +16,13 @@ from caching_flow_runner.lock_storage import clear_lock
 from caching_flow_runner.lock_storage import set_lock
 from caching_flow_runner.task_runner import get_lock
 from caching_flow_runner.test_utils.locks import task_lock_instance
+from caching_flow_runner.test_utils.memory_result import MemoryResult
 from caching_flow_runner.test_utils.memory_result import get_fs
+from caching_flow_runner.test_utils.tasks import dec
 from caching_flow_runner.test_utils.tasks import get
 from caching_flow_runner.test_utils.tasks import inc
 from caching_flow_runner.test_utils.tasks import looping_task
+from caching_flow_runner.test_utils.tasks import multiply
 from caching_flow_runner.test_utils.tasks import test_flow
 
 
@@ -154,6 +158,206 @@ class TestCachedFlowRunner:
 
         # Assert
 
+    def _pre_cache_with_locations(
+        self, inc_location="caching_flow_runner.test_utils.tasks.inc/45e8aaaf26a60b0a847fb7331a0e02aa.pkl", inc_value=2
+    ):
+        locations = {
+            "caching_flow_runner.test_utils.tasks.get": "caching_flow_runner.test_utils.tasks.get/2c671b46cc1b6b790da36e361ccaecf8.pkl",
+            "caching_flow_runner.test_utils.tasks.inc": inc_location,
+        }
+        for key, value in task_lock_instance.items():
+            lock = {**value, "location": locations[key]} if key in locations else value
+            self.lock_store.save(key=key, values=lock)
+        self._serialize_to_cache(locations["caching_flow_runner.test_utils.tasks.get"], 1)
+        self._serialize_to_cache(locations["caching_flow_runner.test_utils.tasks.inc"], inc_value)
+
+    def test_lock_records_target_location(self):
+        # Act
+        self.flow.run(p=1, runner_cls=self.runner_cls, context={"checkpointing": True})
+
+        # Assert
+        lock = get_lock()
+        assert (
+            lock["caching_flow_runner.test_utils.tasks.get"]["location"]
+            == "caching_flow_runner.test_utils.tasks.get/2c671b46cc1b6b790da36e361ccaecf8.pkl"
+        )
+        assert (
+            lock["caching_flow_runner.test_utils.tasks.inc"]["location"]
+            == "caching_flow_runner.test_utils.tasks.inc/45e8aaaf26a60b0a847fb7331a0e02aa.pkl"
+        )
+        assert lock["caching_flow_runner.test_utils.tasks.multiply"]["location"] is None
+
+    def test_prune_flow_keeps_upstream_closure_of_targets(self):
+        # Arrange
+        flow = self.flow.copy()
+        target = flow.get_tasks(name="inc")[0]
+
+        # Act
+        flow, cached_states = CachedFlowRunner.prune_flow(
+            flow=flow, target_tasks=[target], parameters={"p": 1}
+        )
+
+        # Assert
+        task_names = {t.name for t in flow.tasks}
+        assert task_names == {"p", "get", "inc"}
+        edges = {(edge.upstream_task.name, edge.downstream_task.name) for edge in flow.edges}
+        assert edges == {("p", "get"), ("get", "inc")}
+        assert cached_states == {}
+
+    def test_prune_flow_removes_unrelated_branches(self):
+        # Arrange
+        with Flow("two_branches") as flow:
+            p = Parameter("p")
+            q = Parameter("q")
+            p_get = get(p)
+            p_inc = inc(p_get)
+            p_multiply = multiply(p_inc)
+            q_multiply = multiply(get(q))
+
+        # Act
+        flow, _ = CachedFlowRunner.prune_flow(
+            flow=flow, target_tasks=[p_multiply], parameters={"p": 1, "q": 2}
+        )
+
+        # Assert
+        assert flow.tasks == {p, p_get, p_inc, p_multiply}
+        assert q not in flow.tasks
+        assert q_multiply not in flow.tasks
+        assert all(edge.upstream_task in flow.tasks for edge in flow.edges)
+
+    def test_prune_flow_raises_for_unknown_target(self):
+        # Arrange
+        with Flow("other"):
+            other = get(1)
+
+        # Act, Assert
+        with pytest.raises(ValueError):
+            CachedFlowRunner.prune_flow(flow=self.flow.copy(), target_tasks=[other])
+
+    def test_target_tasks_and_optimise_flow_are_exclusive(self):
+        # Act, Assert
+        with pytest.raises(ValueError):
+            self.runner_cls(flow=self.flow, optimise_flow=True, target_tasks=self.flow.tasks)
+
+    def test_target_tasks_loads_cached_frontier(self):
+        # Arrange
+        self._pre_cache_with_locations()
+        target = self.flow.get_tasks(name="multiply")[0]
+        runner_cls = partial(self.runner_cls, target_tasks=[target])
+
+        # Act
+        states = self.flow.run(p=1, runner_cls=runner_cls)
+
+        # Assert
+        result = {task.name: state for task, state in states.result.items()}
+        assert isinstance(result["p"], Pending)
+        assert isinstance(result["get"], Pending)
+        assert result["inc"].message.startswith("Loaded from target")
+        assert isinstance(result["multiply"], Success)
+        assert result["multiply"].result == 4
+
+    def test_target_tasks_reruns_upstream_of_stale_lock(self):
+        # Arrange
+        self._pre_cache_with_locations()
+        inc_lock = self.lock_store.load("caching_flow_runner.test_utils.tasks.inc")
+        inc_lock["inputs"]["b"]["hash"] = "111"
+        self.lock_store.save(key="caching_flow_runner.test_utils.tasks.inc", values=inc_lock)
+        target = self.flow.get_tasks(name="multiply")[0]
+        runner_cls = partial(self.runner_cls, target_tasks=[target])
+
+        # Act
+        states = self.flow.run(p=1, runner_cls=runner_cls)
+
+        # Assert
+        result = {task.name: state for task, state in states.result.items()}
+        assert result["get"].message.startswith("Loaded from target")
+        assert isinstance(result["inc"], Success)
+        assert not result["inc"].message.startswith("Loaded from target")
+        assert result["multiply"].result == 4
+
+    def test_target_tasks_with_cold_cache(self):
+        # Arrange
+        with Flow("two_branches") as flow:
+            p = Parameter("p")
+            q = Parameter("q")
+            p_get = get(p)
+            p_inc = inc(p_get)
+            p_multiply = multiply(p_inc)
+            q_dec = dec(q)
+        dec_lock = {"inputs": {"d": {"hash": "111", "size": 5}}, "result": {"hash": "222", "size": 5}}
+        self.lock_store.save(key="caching_flow_runner.test_utils.tasks.dec", values=dec_lock)
+
+        # Act
+        states = flow.run(p=1, q=2, runner_cls=partial(self.runner_cls, target_tasks=[p_multiply]))
+
+        # Assert
+        assert all(isinstance(states.result[t], Success) for t in (p, p_get, p_inc, p_multiply))
+        assert states.result[p_multiply].result == 4
+        # `Flow.run` reports tasks the runner never saw as not run
+        assert states.result[q].message == "Task not run."
+        assert states.result[q_dec].message == "Task not run."
+        assert self.lock_store.load("caching_flow_runner.test_utils.tasks.dec") == dec_lock
+
+    def test_target_tasks_ignores_location_from_earlier_checkpointed_run(self):
+        # Arrange
+        target = self.flow.get_tasks(name="multiply")[0]
+        self.flow.run(p=1, runner_cls=self.runner_cls, context={"checkpointing": True})
+        clear_lock()
+        self.flow.run(p=2, runner_cls=self.runner_cls, context={"checkpointing": False})
+        clear_lock()
+
+        # Act
+        states = self.flow.run(p=2, runner_cls=partial(self.runner_cls, target_tasks=[target]))
+
+        # Assert
+        result = {task.name: state for task, state in states.result.items()}
+        assert not result["inc"].message.startswith("Loaded from target")
+        assert result["multiply"].result == 6
+
+    def test_target_tasks_reruns_when_target_does_not_match_lock(self):
+        # Arrange
+        self._pre_cache_with_locations(inc_value=5)
+        target = self.flow.get_tasks(name="multiply")[0]
+
+        # Act
+        states = self.flow.run(p=1, runner_cls=partial(self.runner_cls, target_tasks=[target]))
+
+        # Assert
+        result = {task.name: state for task, state in states.result.items()}
+        assert result["get"].message.startswith("Loaded from target")
+        assert not result["inc"].message.startswith("Loaded from target")
+
+    def test_target_tasks_loads_location_containing_braces(self):
+        # Arrange
+        self._pre_cache_with_locations(inc_location="caching_flow_runner.test_utils.tasks.inc/{b}.pkl")
+        target = self.flow.get_tasks(name="multiply")[0]
+
+        # Act
+        states = self.flow.run(p=1, runner_cls=partial(self.runner_cls, target_tasks=[target]))
+
+        # Assert
+        result = {task.name: state for task, state in states.result.items()}
+        assert result["inc"].message.startswith("Loaded from target")
+        assert result["multiply"].result == 4
+
+    def test_target_tasks_loads_cached_frontier_from_flow_result(self):
+        # Arrange
+        with Flow("flow_result", result=MemoryResult()) as flow:
+            p = Parameter("p")
+            d = dec(p)
+        flow.run(p=3, runner_cls=self.runner_cls, context={"checkpointing": True})
+        clear_lock()
+        with flow:
+            m = multiply(d)
+
+        # Act
+        states = flow.run(p=3, runner_cls=partial(self.runner_cls, target_tasks=[m]))
+
+        # Assert
+        assert isinstance(states.result[p], Pending)
+        assert states.result[d].message.startswith("Loaded from target")
+        assert states.result[m].result == 4
+
     # def test_flow_runner_no_cache(self):
     #     # Act
     #     self.flow.run(p=1, runner_cls=self.runner_cls)